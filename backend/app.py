@@ -1,11 +1,16 @@
 from flask import Flask, jsonify
 from flask_cors import CORS
+from werkzeug.middleware.proxy_fix import ProxyFix
 import logging
 import os
+from config import Config
 from models import init_db, close_db
 from routes.auth import auth_bp
 from routes.game import game_bp
-from routes.admin import admin_bp
+from routes.admin import admin_bp, verify_admin_token
+from utils.profiler import init_profiler
+from utils.rate_limiter import init_rate_limiter
+from utils.static_files import init_frontend
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -15,14 +20,40 @@ def create_app():
     """Create and configure Flask application"""
     app = Flask(__name__)
     
+    # Trust X-Forwarded-For from known reverse proxies so remote_addr is the client
+    if Config.TRUSTED_PROXY_COUNT:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=Config.TRUSTED_PROXY_COUNT)
+    
     # Enable CORS for frontend
     CORS(app, origins=['http://localhost:3000'])
     
+    # Shed abusive clients before any request parsing or database work
+    if Config.RATE_LIMIT_ENABLED:
+        init_rate_limiter(
+            app,
+            Config.RATE_LIMITS,
+            Config.RATE_LIMIT_TABLE_PATH,
+            Config.RATE_LIMIT_SLOTS
+        )
+    
     # Register blueprints
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(game_bp, url_prefix='/api/game')
     app.register_blueprint(admin_bp, url_prefix='/api/admin')
     
+    # Request profiling (sampled by rate or requested by an admin token)
+    init_profiler(
+        app,
+        sample_rate=Config.PROFILE_SAMPLE_RATE,
+        interval_ms=Config.PROFILE_INTERVAL_MS,
+        directory=Config.PROFILE_DIR,
+        is_authorized=lambda: verify_admin_token()[0] is not None
+    )
+    
+    # Serve built frontend (one deployable unit instead of a separate static server)
+    if Config.FRONTEND_DIST_DIR:
+        init_frontend(app, Config.FRONTEND_DIST_DIR)
+    
     # Error handlers
     @app.errorhandler(404)
     def not_found(error):
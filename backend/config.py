@@ -3,6 +3,8 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
 class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key')
     JWT_SECRET = os.getenv('JWT_SECRET', 'dev-jwt-secret')
@@ -14,6 +16,34 @@ class Config:
     MAX_GUESSES_PER_GAME = 5
     WORD_LENGTH = 5
     
+    # Username existence filter (Bloom filter checked before MongoDB lookups)
+    USERNAME_FILTER_CAPACITY = int(os.getenv('USERNAME_FILTER_CAPACITY', 100000))
+    USERNAME_FILTER_ERROR_RATE = float(os.getenv('USERNAME_FILTER_ERROR_RATE', 0.01))
+    USERNAME_FILTER_PATH = os.getenv('USERNAME_FILTER_PATH', 'username_filter.bin')
+    
+    # Request profiling (admins can also profile a request with the X-Profile-Request header)
+    PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', 0.0))
+    PROFILE_INTERVAL_MS = int(os.getenv('PROFILE_INTERVAL_MS', 5))
+    # Directory where workers share profile samples; empty keeps them per worker
+    PROFILE_DIR = os.getenv('PROFILE_DIR', os.path.join(BASE_DIR, 'profiles'))
+    
+    # Built frontend to serve from the backend (e.g. ../frontend/dist); disabled when empty
+    FRONTEND_DIST_DIR = os.getenv('FRONTEND_DIST_DIR', '')
+    
+    # Rate limiting: blueprint -> {'ip' | 'user': (requests, period_seconds)}
+    RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    RATE_LIMITS = {
+        'auth': {'ip': (10, 60)},
+        'game': {'ip': (120, 60), 'user': (60, 60)}
+    }
+    # Shared only by workers of this checkout; set explicitly to share across deployments
+    RATE_LIMIT_TABLE_PATH = os.getenv('RATE_LIMIT_TABLE_PATH', os.path.join(BASE_DIR, 'rate_limits.bin'))
+    RATE_LIMIT_SLOTS = int(os.getenv('RATE_LIMIT_SLOTS', 65536))
+    
+    # Number of trusted reverse proxies in front of the app; when set, client IPs
+    # are taken from X-Forwarded-For so per-IP limits see real clients
+    TRUSTED_PROXY_COUNT = int(os.getenv('TRUSTED_PROXY_COUNT', 0))
+    
     # Initial words for the database
     INITIAL_WORDS = [
         'APPLE', 'BREAD', 'CHAIR', 'DANCE', 'EAGLE', 
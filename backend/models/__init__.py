@@ -1,14 +1,16 @@
 from pymongo import MongoClient
 from config import Config
+from utils.username_filter import build_username_filter
 import logging
 
 # Database connection
 client = None
 db = None
+username_filter = None
 
 def init_db():
     """Initialize database connection and create collections with indexes"""
-    global client, db
+    global client, db, username_filter
     
     try:
         client = MongoClient(Config.MONGO_URI)
@@ -25,6 +27,14 @@ def init_db():
             db.words.insert_many(words_data)
             logging.info(f"Initialized words collection with {len(Config.INITIAL_WORDS)} words")
         
+        # Build username filter so registration can skip lookups for new usernames
+        username_filter = build_username_filter(
+            db,
+            Config.USERNAME_FILTER_CAPACITY,
+            Config.USERNAME_FILTER_ERROR_RATE,
+            Config.USERNAME_FILTER_PATH
+        )
+        
         logging.info("Database initialized successfully")
         return True
         
@@ -36,8 +46,23 @@ def get_db():
     """Get database instance"""
     return db
 
+def get_username_filter():
+    """Get username filter instance"""
+    return username_filter
+
+def username_may_exist(username):
+    """Return False only if the username is definitely not registered"""
+    if username_filter is None:
+        return True
+    return username_filter.might_contain(username)
+
 def close_db():
     """Close database connection"""
     global client
+    if username_filter and Config.USERNAME_FILTER_PATH:
+        try:
+            username_filter.save(Config.USERNAME_FILTER_PATH)
+        except OSError as e:
+            logging.warning(f"Failed to save username filter: {str(e)}")
     if client:
         client.close()
@@ -1,5 +1,6 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 import jwt
+import os
 from datetime import datetime, date
 from models import get_db
 from utils.validators import validate_word, validate_date_string, get_today_date
@@ -83,8 +84,9 @@ def get_user_report():
         
         db = get_db()
         
-        # Check if user exists
-        user = db.users.find_one({'username': username})
+        # Check if user exists (always MongoDB: the username filter can miss
+        # users registered through other workers)
+        user = db.users.find_one({'username': username}, {'_id': 1})
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
@@ -196,3 +198,77 @@ def get_words():
         
     except Exception as e:
         return jsonify({'error': f'Failed to get words: {str(e)}'}), 500
+
+@admin_bp.route('/profiles', methods=['GET'])
+def get_profiles():
+    """Get profiled request and sample counts per endpoint"""
+    try:
+        payload, error_response, status_code = verify_admin_token()
+        if error_response:
+            return error_response, status_code
+        
+        profiler = current_app.extensions['profiler']
+        endpoints, workers = profiler.summary()
+        
+        return jsonify({
+            'sample_rate': profiler.sample_rate,
+            'pid': os.getpid(),
+            'workers': workers,
+            'shared': bool(profiler.directory),
+            'endpoints': endpoints
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': f'Failed to get profiles: {str(e)}'}), 500
+
+@admin_bp.route('/profiles/flamegraph', methods=['GET'])
+def get_flamegraph():
+    """Get collapsed-stack flamegraph text, optionally for a single endpoint"""
+    try:
+        payload, error_response, status_code = verify_admin_token()
+        if error_response:
+            return error_response, status_code
+        
+        profiler = current_app.extensions['profiler']
+        endpoint = request.args.get('endpoint')
+        
+        return profiler.collapsed(endpoint), 200, {'Content-Type': 'text/plain; charset=utf-8'}
+        
+    except Exception as e:
+        return jsonify({'error': f'Failed to get flamegraph: {str(e)}'}), 500
+
+@admin_bp.route('/profiles', methods=['DELETE'])
+def reset_profiles():
+    """Discard collected profiling samples"""
+    try:
+        payload, error_response, status_code = verify_admin_token()
+        if error_response:
+            return error_response, status_code
+        
+        current_app.extensions['profiler'].reset()
+        
+        return jsonify({'message': 'Profiles reset successfully'}), 200
+        
+    except Exception as e:
+        return jsonify({'error': f'Failed to reset profiles: {str(e)}'}), 500
+
+@admin_bp.route('/rate-limits', methods=['GET'])
+def get_rate_limits():
+    """Get allowed and rejected request counts per rate-limited blueprint"""
+    try:
+        payload, error_response, status_code = verify_admin_token()
+        if error_response:
+            return error_response, status_code
+        
+        rate_limiter = current_app.extensions.get('rate_limiter')
+        if not rate_limiter:
+            return jsonify({'enabled': False, 'counters': {}}), 200
+        
+        return jsonify({
+            'enabled': True,
+            'limits': Config.RATE_LIMITS,
+            'counters': rate_limiter.counters()
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': f'Failed to get rate limits: {str(e)}'}), 500
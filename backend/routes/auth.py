@@ -2,7 +2,8 @@ from flask import Blueprint, request, jsonify
 import bcrypt
 import jwt
 from datetime import datetime, timedelta
-from models import get_db
+from pymongo.errors import DuplicateKeyError
+from models import get_db, get_username_filter, username_may_exist
 from utils.validators import validate_username, validate_password
 from config import Config
 
@@ -33,8 +34,8 @@ def register():
         
         db = get_db()
         
-        # Check if username already exists
-        if db.users.find_one({'username': username}):
+        # Check if username already exists (filter negatives skip MongoDB)
+        if username_may_exist(username) and db.users.find_one({'username': username}, {'_id': 1}):
             return jsonify({'error': 'Username already exists'}), 400
         
         # Hash password
@@ -48,10 +49,17 @@ def register():
             'created_at': datetime.utcnow()
         }
         
-        # Insert user
-        result = db.users.insert_one(user_doc)
+        # Insert user (unique index is the source of truth for conflicts)
+        try:
+            result = db.users.insert_one(user_doc)
+        except DuplicateKeyError:
+            return jsonify({'error': 'Username already exists'}), 400
         
         if result.inserted_id:
+            username_filter = get_username_filter()
+            if username_filter:
+                username_filter.add(username)
+            
             return jsonify({
                 'message': 'User registered successfully',
                 'username': username,
@@ -57,6 +57,18 @@ def calculate_feedback(guess, target_word):
     
     return feedback
 
+def calculate_letter_states(guesses):
+    """
+    Aggregate keyboard letter states from previous guesses.
+    A letter keeps its first feedback unless a later guess marks it 'correct'.
+    """
+    letter_states = {}
+    for guess in guesses:
+        for letter, state in zip(guess['word'], guess['feedback']):
+            if letter not in letter_states or state == 'correct':
+                letter_states[letter] = state
+    return letter_states
+
 @game_bp.route('/start', methods=['POST'])
 def start_game():
     """Start a new game"""
@@ -225,3 +237,55 @@ def get_game_status():
         
     except Exception as e:
         return jsonify({'error': f'Failed to get game status: {str(e)}'}), 500
+
+@game_bp.route('/session', methods=['GET'])
+def get_game_session():
+    """Get daily game status, in-progress game and keyboard state in one call"""
+    try:
+        payload, error_response, status_code = verify_token()
+        if error_response:
+            return error_response, status_code
+        
+        username = payload['username']
+        db = get_db()
+        today = get_today_date()
+        
+        # Single query on the (username, started_at) index; target word is never sent
+        games_today = list(db.games.find(
+            {
+                'username': username,
+                'started_at': {'$gte': datetime.strptime(today, '%Y-%m-%d')}
+            },
+            {'guesses.word': 1, 'guesses.feedback': 1, 'completed': 1, 'started_at': 1}
+        ).sort('started_at', 1))
+        
+        games_played_today = len(games_today)
+        remaining_games = max(0, Config.MAX_GAMES_PER_DAY - games_played_today)
+        
+        # Latest unfinished game can be resumed without using up a daily game
+        current_game = None
+        letter_states = {}
+        in_progress = [game for game in games_today if not game['completed']]
+        if in_progress:
+            game = in_progress[-1]
+            guesses = [
+                {'word': guess['word'], 'feedback': guess['feedback']}
+                for guess in game['guesses']
+            ]
+            letter_states = calculate_letter_states(guesses)
+            current_game = {
+                'game_id': str(game['_id']),
+                'guesses': guesses,
+                'guesses_remaining': Config.MAX_GUESSES_PER_GAME - len(guesses),
+                'started_at': game['started_at'].isoformat()
+            }
+        
+        return jsonify({
+            'games_played_today': games_played_today,
+            'remaining_games': remaining_games,
+            'current_game': current_game,
+            'letter_states': letter_states
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': f'Failed to get game session: {str(e)}'}), 500
@@ -0,0 +1,252 @@
+import glob
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from flask import request, g
+
+PROFILE_HEADER = 'X-Profile-Request'
+
+# Label for requests that match no route, so random URLs cannot grow the tables
+UNMATCHED_ENDPOINT = '<unmatched>'
+
+# How often a busy worker writes its samples to the shared directory
+FLUSH_INTERVAL = 1.0
+
+class RequestProfiler:
+    """
+    Low-overhead stack sampler for live requests.
+    - Requests are profiled when sampled by rate or explicitly requested by an admin
+    - A single background thread samples the stacks of profiled request threads
+    - Samples are aggregated per endpoint as collapsed stacks (flamegraph input)
+    - With a directory, each worker writes its samples to <pid>.json there and reads
+      merge every worker's file, so any worker can answer for all of them
+    """
+
+    def __init__(self, sample_rate=0.0, interval_ms=5, directory=None, max_depth=64):
+        self.sample_rate = sample_rate
+        self.interval = interval_ms / 1000.0
+        self.directory = directory
+        self.max_depth = max_depth
+
+        if directory:
+            try:
+                os.makedirs(directory, exist_ok=True)
+            except OSError as e:
+                logging.error(f"Profiles are per worker only: cannot create {directory}: {str(e)}")
+                self.directory = None
+
+        self._init_state()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._init_state)
+
+    def _init_state(self):
+        # Also runs in forked children: the sampler thread and samples are not inherited
+        self._active = {}
+        self._stacks = defaultdict(Counter)
+        self._requests = Counter()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._dirty = False
+        self._last_flush = 0.0
+        self._reset_at = self._reset_marker_time()
+
+    def _worker_path(self):
+        return os.path.join(self.directory, f'{os.getpid()}.json')
+
+    def _reset_marker_time(self):
+        if not self.directory:
+            return 0.0
+        try:
+            return os.stat(os.path.join(self.directory, 'reset')).st_mtime
+        except OSError:
+            return 0.0
+
+    def _check_reset(self):
+        """Drop in-memory samples if another worker reset the profiles. Call with the lock held."""
+        reset_at = self._reset_marker_time()
+        if reset_at > self._reset_at:
+            self._stacks.clear()
+            self._requests.clear()
+            self._dirty = False
+            self._reset_at = reset_at
+
+    def start(self, endpoint):
+        """Start sampling the current thread for the given endpoint"""
+        with self._lock:
+            self._check_reset()
+            self._active[threading.get_ident()] = endpoint
+            self._requests[endpoint] += 1
+            self._dirty = True
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+                self._thread.start()
+            self._wakeup.set()
+
+    def stop(self):
+        """Stop sampling the current thread"""
+        with self._lock:
+            self._active.pop(threading.get_ident(), None)
+
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            time.sleep(self.interval)
+
+            with self._lock:
+                active = list(self._active.items())
+                if not active:
+                    self._wakeup.clear()
+
+            if active:
+                frames = sys._current_frames()
+                samples = []
+                for ident, endpoint in active:
+                    frame = frames.get(ident)
+                    if frame is not None:
+                        samples.append((endpoint, self._collapse(frame)))
+
+                with self._lock:
+                    for endpoint, stack in samples:
+                        self._stacks[endpoint][stack] += 1
+                    self._dirty = self._dirty or bool(samples)
+
+            if not active or time.time() - self._last_flush >= FLUSH_INTERVAL:
+                self._flush()
+
+    def _flush(self):
+        """Write this worker's samples to the shared directory"""
+        if not self.directory:
+            return
+
+        with self._lock:
+            if not self._dirty:
+                return
+            self._check_reset()
+            data = {
+                'requests': dict(self._requests),
+                'stacks': {endpoint: dict(stacks) for endpoint, stacks in self._stacks.items()}
+            }
+            self._dirty = False
+            self._last_flush = time.time()
+
+        path = self._worker_path()
+        try:
+            with open(f'{path}.tmp', 'w') as f:
+                json.dump(data, f)
+            os.replace(f'{path}.tmp', path)
+        except OSError as e:
+            logging.warning(f"Failed to write profile samples: {str(e)}")
+
+    def _collapse(self, frame):
+        """Render a frame chain as 'root;...;leaf' with 'file:function' entries"""
+        names = []
+        while frame is not None and len(names) < self.max_depth:
+            code = frame.f_code
+            names.append(f'{os.path.basename(code.co_filename)}:{code.co_name}')
+            frame = frame.f_back
+        return ';'.join(reversed(names))
+
+    def _merged(self):
+        """Get (requests, stacks, worker count) for this worker plus every other worker's file"""
+        with self._lock:
+            self._check_reset()
+            requests = Counter(self._requests)
+            stacks = defaultdict(Counter, {endpoint: Counter(s) for endpoint, s in self._stacks.items()})
+
+        workers = 1
+        if self.directory:
+            own_path = self._worker_path()
+            for path in glob.glob(os.path.join(self.directory, '*.json')):
+                if path == own_path:
+                    continue
+                try:
+                    # A worker may have written stale samples while a reset was in progress
+                    if os.stat(path).st_mtime < self._reset_at:
+                        continue
+                    with open(path) as f:
+                        data = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                workers += 1
+                requests.update(data.get('requests', {}))
+                for endpoint, endpoint_stacks in data.get('stacks', {}).items():
+                    stacks[endpoint].update(endpoint_stacks)
+
+        return requests, stacks, workers
+
+    def summary(self):
+        """Get profiled request and sample counts per endpoint across workers"""
+        requests, stacks, workers = self._merged()
+        return {
+            endpoint: {
+                'requests': requests[endpoint],
+                'samples': sum(stacks[endpoint].values())
+            }
+            for endpoint in requests
+        }, workers
+
+    def collapsed(self, endpoint=None):
+        """Get collapsed-stack text for one endpoint or all endpoints across workers"""
+        requests, stacks, workers = self._merged()
+        endpoints = [endpoint] if endpoint else list(stacks)
+        lines = []
+        for name in endpoints:
+            prefix = '' if endpoint else f'{name};'
+            for stack, count in stacks.get(name, {}).items():
+                lines.append(f'{prefix}{stack} {count}')
+        return '\n'.join(lines) + ('\n' if lines else '')
+
+    def reset(self):
+        """Discard all collected samples, including those of other workers"""
+        with self._lock:
+            self._stacks.clear()
+            self._requests.clear()
+            self._dirty = False
+
+            if self.directory:
+                marker = os.path.join(self.directory, 'reset')
+                with open(marker, 'w'):
+                    pass
+                os.utime(marker)
+                self._reset_at = self._reset_marker_time()
+                for path in glob.glob(os.path.join(self.directory, '*.json')):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+
+def init_profiler(app, sample_rate=0.0, interval_ms=5, directory=None, is_authorized=None):
+    """
+    Register request hooks for profiling.
+    When sample_rate is 0 and no profile header is sent, a request only pays for
+    one header lookup.
+    Samples are shared between workers on one host through directory; without it,
+    each worker only reports the requests it profiled itself.
+    """
+    profiler = RequestProfiler(sample_rate, interval_ms, directory)
+    app.extensions['profiler'] = profiler
+
+    @app.before_request
+    def start_profiling():
+        if request.headers.get(PROFILE_HEADER):
+            if not (is_authorized and is_authorized()):
+                return None
+        elif not (profiler.sample_rate and random.random() < profiler.sample_rate):
+            return None
+
+        g._profiling = True
+        profiler.start(request.endpoint or UNMATCHED_ENDPOINT)
+        return None
+
+    @app.teardown_request
+    def stop_profiling(error=None):
+        if g.pop('_profiling', False):
+            profiler.stop()
+
+    return profiler
@@ -0,0 +1,227 @@
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+import jwt
+from flask import request, jsonify
+from config import Config
+
+try:
+    import fcntl
+except ImportError:  # Windows: buckets are only shared between threads of one process
+    fcntl = None
+
+# Table header: magic, slot count, digest of counter names
+_HEADER = struct.Struct('<4sQ16s')
+_MAGIC = b'RLT1'
+# Per-blueprint counters: allowed, rejected
+_COUNTER = struct.Struct('<QQ')
+# Bucket slot: key hash, tokens, last refill time
+_SLOT = struct.Struct('<Qdd')
+
+class SharedTokenBuckets:
+    """
+    Token buckets stored in a memory-mapped file shared by all worker processes.
+    - The file header records the table layout; a file with another layout is never resized
+    - Buckets live in a fixed-size, direct-mapped table keyed by a hash of the bucket key
+    - A colliding key simply resets the slot, which can only make the limiter more lenient
+    - Allowed/rejected counters per blueprint follow the header
+    """
+
+    def __init__(self, path, num_slots, counter_names):
+        self.num_slots = num_slots
+        self.counter_index = {name: i for i, name in enumerate(counter_names)}
+        self.counters_offset = _HEADER.size
+        self.header_size = _HEADER.size + _COUNTER.size * len(counter_names)
+        self.size = self.header_size + _SLOT.size * num_slots
+
+        names_digest = hashlib.blake2b(','.join(counter_names).encode('utf-8'), digest_size=16).digest()
+        self.header = _HEADER.pack(_MAGIC, num_slots, names_digest)
+
+        # Processes configured with another layout get their own table file
+        self.path = path
+        if not self._open(path):
+            self.path = f'{path}.{hashlib.blake2b(self.header, digest_size=8).hexdigest()}'
+            if not self._open(self.path):
+                raise ValueError(f'Rate limit table {self.path} has an incompatible layout')
+
+        self._lock = threading.Lock()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _open(self, path):
+        """Map the table file, initializing it if new. Returns False on a layout mismatch."""
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            # Closing the descriptor on a mismatch or error also releases the lock
+            if fcntl:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+
+            size = os.fstat(fd).st_size
+            if size == 0:
+                os.ftruncate(fd, self.size)
+                os.write(fd, self.header)
+            elif size != self.size or os.read(fd, _HEADER.size) != self.header:
+                os.close(fd)
+                return False
+
+            self._mm = mmap.mmap(fd, self.size)
+            if fcntl:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        except BaseException:
+            os.close(fd)
+            raise
+
+        self._fd = fd
+        self._pid = os.getpid()
+        return True
+
+    def _after_fork(self):
+        # A lock held by another parent thread at fork time would never be released
+        self._lock = threading.Lock()
+
+    def _reopen(self):
+        """
+        Open a descriptor of our own after a fork. flock belongs to the open file
+        description, so an inherited descriptor would share the parent's lock.
+        """
+        self._mm.close()
+        os.close(self._fd)
+        if not self._open(self.path):
+            raise ValueError(f'Rate limit table {self.path} changed layout')
+
+    def _acquire(self):
+        self._lock.acquire()
+        try:
+            if self._pid != os.getpid():
+                self._reopen()
+            if fcntl:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+        except BaseException:
+            self._lock.release()
+            raise
+
+    def _release(self):
+        if fcntl:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._lock.release()
+
+    def _slot_offset(self, key_hash):
+        return self.header_size + (key_hash % self.num_slots) * _SLOT.size
+
+    def consume(self, counter_name, buckets):
+        """
+        Take one token from each (key, limit, period) bucket.
+        Returns (allowed, retry_after_seconds). No tokens are taken if any bucket is empty.
+        """
+        now = time.time()
+        hashes = [
+            int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little')
+            for key, limit, period in buckets
+        ]
+
+        self._acquire()
+        try:
+            updates = []
+            retry_after = 0.0
+            for key_hash, (key, limit, period) in zip(hashes, buckets):
+                offset = self._slot_offset(key_hash)
+                stored_hash, tokens, last = _SLOT.unpack_from(self._mm, offset)
+                rate = limit / period
+
+                if stored_hash != key_hash:
+                    tokens = float(limit)
+                else:
+                    tokens = min(float(limit), tokens + max(0.0, now - last) * rate)
+
+                if tokens < 1:
+                    retry_after = max(retry_after, (1 - tokens) / rate)
+                updates.append((offset, key_hash, tokens))
+
+            allowed = retry_after == 0.0
+            for offset, key_hash, tokens in updates:
+                _SLOT.pack_into(self._mm, offset, key_hash, tokens - 1 if allowed else tokens, now)
+
+            counter_offset = self.counters_offset + self.counter_index[counter_name] * _COUNTER.size
+            allowed_count, rejected_count = _COUNTER.unpack_from(self._mm, counter_offset)
+            if allowed:
+                allowed_count += 1
+            else:
+                rejected_count += 1
+            _COUNTER.pack_into(self._mm, counter_offset, allowed_count, rejected_count)
+        finally:
+            self._release()
+
+        return allowed, retry_after
+
+    def counters(self):
+        """Get allowed/rejected request counts per blueprint across all workers"""
+        result = {}
+        for name, index in self.counter_index.items():
+            allowed_count, rejected_count = _COUNTER.unpack_from(self._mm, self.counters_offset + index * _COUNTER.size)
+            result[name] = {'allowed': allowed_count, 'rejected': rejected_count}
+        return result
+
+def _token_username():
+    """Get username from a valid bearer token, or None"""
+    auth_header = request.headers.get('Authorization')
+    if not auth_header or not auth_header.startswith('Bearer '):
+        return None
+
+    try:
+        token = auth_header.split(' ')[1]
+        return jwt.decode(token, Config.JWT_SECRET, algorithms=['HS256']).get('username')
+    except jwt.InvalidTokenError:
+        return None
+
+def init_rate_limiter(app, limits, path, num_slots):
+    """
+    Register a before_request hook that sheds requests exceeding the per-blueprint limits.
+    limits maps blueprint name to {'ip': (limit, period_seconds), 'user': (limit, period_seconds)}.
+    Returns None, with an error logged, if the shared table cannot be opened.
+    """
+    try:
+        buckets = SharedTokenBuckets(path, num_slots, sorted(limits))
+    except (OSError, ValueError) as e:
+        logging.error(
+            f"Rate limiting disabled: cannot open rate limit table {path}: {str(e)}. "
+            f"Check RATE_LIMIT_TABLE_PATH points to a file this user can create and write."
+        )
+        return None
+    app.extensions['rate_limiter'] = buckets
+
+    @app.before_request
+    def check_rate_limit():
+        # CORS preflights carry no credentials and must not spend tokens
+        if request.method == 'OPTIONS':
+            return None
+
+        blueprint_limits = limits.get(request.blueprint)
+        if not blueprint_limits:
+            return None
+
+        checks = []
+        if 'ip' in blueprint_limits:
+            limit, period = blueprint_limits['ip']
+            checks.append((f'{request.blueprint}:ip:{request.remote_addr}', limit, period))
+        if 'user' in blueprint_limits:
+            username = _token_username()
+            if username:
+                limit, period = blueprint_limits['user']
+                checks.append((f'{request.blueprint}:user:{username}', limit, period))
+
+        if not checks:
+            return None
+
+        allowed, retry_after = buckets.consume(request.blueprint, checks)
+        if allowed:
+            return None
+
+        response = jsonify({'error': 'Too many requests. Please try again later.'})
+        response.headers['Retry-After'] = str(max(1, int(retry_after + 0.999)))
+        return response, 429
+
+    return buckets
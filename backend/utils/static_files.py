@@ -0,0 +1,79 @@
+import mimetypes
+import os
+import re
+from flask import abort, request, send_file
+from werkzeug.routing import PathConverter
+from werkzeug.security import safe_join
+
+# Vite emits content-hashed names such as index-7704ba4f.js
+HASHED_ASSET_PATTERN = re.compile(r'-[0-9a-f]{8,}\.')
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# Precompressed variants in order of preference
+PRECOMPRESSED_ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+class FrontendPathConverter(PathConverter):
+    """Path converter that never matches API routes"""
+    regex = r'(?!api(?:/|$))[^/].*?'
+
+def select_encoding(path):
+    """Pick the best precompressed variant accepted by the client"""
+    for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+        if request.accept_encodings[encoding] > 0 and os.path.isfile(path + suffix):
+            return encoding, path + suffix
+    return None, path
+
+def send_frontend_file(dist_dir, filename):
+    """Send a file from the build directory with caching and precompression"""
+    # Precompressed variants are only served through Accept-Encoding negotiation
+    if filename.endswith(tuple(suffix for encoding, suffix in PRECOMPRESSED_ENCODINGS)):
+        return None
+
+    path = safe_join(dist_dir, filename)
+    if path is None or not os.path.isfile(path):
+        return None
+
+    encoding, send_path = select_encoding(path)
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+    # send_file streams through wsgi.file_wrapper, which servers such as
+    # Gunicorn implement with sendfile(2)
+    response = send_file(send_path, mimetype=mimetype, conditional=True, etag=True)
+
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+
+    if HASHED_ASSET_PATTERN.search(os.path.basename(filename)):
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    else:
+        response.headers['Cache-Control'] = 'no-cache'
+
+    return response
+
+def init_frontend(app, dist_dir):
+    """
+    Serve the built frontend from dist_dir:
+    - Hashed assets are cached as immutable
+    - Other files (index.html) are revalidated with ETags
+    - Unknown non-file paths fall back to index.html for client-side routing
+    """
+    dist_dir = os.path.abspath(dist_dir)
+    app.url_map.converters['frontend_path'] = FrontendPathConverter
+
+    @app.route('/', defaults={'filename': ''}, methods=['GET'])
+    @app.route('/<frontend_path:filename>', methods=['GET'])
+    def serve_frontend(filename):
+        if filename:
+            response = send_frontend_file(dist_dir, filename)
+            if response is not None:
+                return response
+
+            # Missing files with an extension are real 404s, not client routes
+            if '.' in os.path.basename(filename):
+                abort(404)
+
+        response = send_frontend_file(dist_dir, 'index.html')
+        if response is None:
+            abort(404)
+        return response
@@ -0,0 +1,127 @@
+import hashlib
+import logging
+import math
+import os
+import struct
+import threading
+from datetime import timedelta
+from bson import ObjectId
+
+# File header: magic, bit count, hash count, capacity, item count, highest user _id scanned
+_HEADER = struct.Struct('<4sQIQQ12s')
+_MAGIC = b'UBF2'
+_NO_ID = bytes(12)
+
+# ObjectIds from different processes are only ordered by their second-resolution
+# timestamp, so catch-up scans re-read a window before last_id
+_SCAN_OVERLAP = timedelta(seconds=60)
+
+class UsernameFilter:
+    """
+    Bloom filter of registered usernames.
+    - A negative answer means the username was not seen by this filter
+    - A positive answer may be a false positive and must be confirmed in MongoDB
+    - last_id is the highest user _id scanned from MongoDB; newer users are pulled on load
+    """
+
+    def __init__(self, capacity, error_rate, num_bits=None, num_hashes=None, bits=None, count=0, last_id=None):
+        capacity = max(1, int(capacity))
+        if num_bits is None:
+            num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        if num_hashes is None:
+            num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+
+        self.capacity = capacity
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bits if bits is not None else bytearray((num_bits + 7) // 8)
+        self.count = count
+        self.last_id = last_id
+        self._lock = threading.Lock()
+
+    def _positions(self, username):
+        """Derive bit positions using double hashing over a single blake2b digest"""
+        digest = hashlib.blake2b(username.encode('utf-8'), digest_size=16).digest()
+        h1, h2 = struct.unpack('<QQ', digest)
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, username):
+        """Add a username to the filter"""
+        with self._lock:
+            for pos in self._positions(username):
+                self.bits[pos >> 3] |= 1 << (pos & 7)
+            self.count += 1
+
+    def might_contain(self, username):
+        """Return False if the username is definitely not registered"""
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(username))
+
+    def scan(self, db):
+        """Add users created since last_id, using a username-only scan in _id order"""
+        query = {}
+        if self.last_id is not None:
+            since = ObjectId.from_datetime(self.last_id.generation_time - _SCAN_OVERLAP)
+            query = {'_id': {'$gte': since}}
+        cursor = db.users.find(query, {'username': 1}, batch_size=1000).sort('_id', 1)
+        added = 0
+        for doc in cursor:
+            self.add(doc['username'])
+            self.last_id = doc['_id']
+            added += 1
+        return added
+
+    def save(self, path):
+        """Write the filter to disk atomically"""
+        tmp_path = f'{path}.tmp'
+        with self._lock:
+            last_id = self.last_id.binary if self.last_id is not None else _NO_ID
+            with open(tmp_path, 'wb') as f:
+                f.write(_HEADER.pack(
+                    _MAGIC, self.num_bits, self.num_hashes, self.capacity, self.count, last_id
+                ))
+                f.write(self.bits)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Load a filter previously written with save(), or None if unreadable"""
+        try:
+            with open(path, 'rb') as f:
+                magic, num_bits, num_hashes, capacity, count, last_id = _HEADER.unpack(f.read(_HEADER.size))
+                bits = bytearray(f.read())
+        except (OSError, struct.error):
+            return None
+
+        if magic != _MAGIC or len(bits) != (num_bits + 7) // 8:
+            return None
+
+        return cls(
+            capacity, 0.5, num_bits=num_bits, num_hashes=num_hashes, bits=bits, count=count,
+            last_id=ObjectId(last_id) if last_id != _NO_ID else None
+        )
+
+def build_username_filter(db, capacity, error_rate, path=None):
+    """
+    Load the username filter from disk and pull users created since it was saved,
+    or rebuild it from a username-only scan of the users collection.
+    Deleted users only cause false positives, so a snapshot never needs rebuilding for them.
+    """
+    username_filter = UsernameFilter.load(path) if path and os.path.exists(path) else None
+
+    if username_filter and username_filter.count <= username_filter.capacity:
+        added = username_filter.scan(db)
+        logging.info(f"Loaded username filter from {path} ({added} new users)")
+    else:
+        user_count = db.users.estimated_document_count()
+        username_filter = UsernameFilter(max(capacity, user_count * 2), error_rate)
+        username_filter.scan(db)
+        logging.info(f"Built username filter from {username_filter.count} users")
+
+    if path:
+        try:
+            username_filter.save(path)
+        except OSError as e:
+            logging.warning(f"Failed to save username filter: {str(e)}")
+
+    return username_filter
@@ -0,0 +1,24 @@
+// Write precompressed .br and .gz variants of the build output so the
+// backend can serve them directly based on Accept-Encoding.
+import fs from 'fs';
+import path from 'path';
+import zlib from 'zlib';
+
+const distDir = path.resolve('dist');
+const compressible = /\.(js|css|html|svg|json|map|txt)$/;
+
+const walk = (dir) =>
+  fs.readdirSync(dir, { withFileTypes: true }).flatMap((entry) => {
+    const fullPath = path.join(dir, entry.name);
+    return entry.isDirectory() ? walk(fullPath) : [fullPath];
+  });
+
+walk(distDir)
+  .filter((file) => compressible.test(file))
+  .forEach((file) => {
+    const content = fs.readFileSync(file);
+    fs.writeFileSync(`${file}.br`, zlib.brotliCompressSync(content, {
+      params: { [zlib.constants.BROTLI_PARAM_QUALITY]: zlib.constants.BROTLI_MAX_QUALITY },
+    }));
+    fs.writeFileSync(`${file}.gz`, zlib.gzipSync(content, { level: 9 }));
+  });
@@ -18,11 +18,27 @@ const GameBoard = () => {
   const [error, setError] = useState('');
   const [usedLetters, setUsedLetters] = useState({});
 
-  // Load game status on component mount
+  // Load game status and resume any in-progress game on component mount
   useEffect(() => {
-    loadGameStatus();
+    loadGameSession();
   }, []);
 
+  const loadGameSession = async () => {
+    try {
+      const response = await gameAPI.getGameSession();
+      const { games_played_today, remaining_games, current_game, letter_states } = response.data;
+      setGameStatus({ games_played_today, remaining_games });
+
+      if (current_game) {
+        setGameId(current_game.game_id);
+        setGuesses(current_game.guesses);
+        setUsedLetters(letter_states);
+      }
+    } catch (err) {
+      console.error('Failed to load game session:', err);
+    }
+  };
+
   const loadGameStatus = async () => {
     try {
       const response = await gameAPI.getGameStatus();
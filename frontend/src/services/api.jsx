@@ -1,6 +1,7 @@
 import axios from 'axios';
 
-const API_BASE_URL = 'http://localhost:5000/api';
+// Relative by default: the Vite dev server proxies /api and the backend serves the build
+const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || '/api';
 
 // Create axios instance
 const api = axios.create({
@@ -50,6 +51,7 @@ export const gameAPI = {
   startGame: () => api.post('/game/start'),
   submitGuess: (gameId, word) => api.post('/game/guess', { game_id: gameId, word }),
   getGameStatus: () => api.get('/game/status'),
+  getGameSession: () => api.get('/game/session'),
 };
 
 // Admin API